@@ -21,11 +21,11 @@ from enum import Enum, IntEnum
 from typing import (
     Any,
     Callable,
+    FrozenSet,
     List,
     Optional,
     Pattern,
     Sequence,
-    Set,
     Tuple,
     Union,
     cast, Dict,
@@ -117,7 +117,11 @@ class Check:
             creation_func,
         )
 
-    def required_analyzers(self) -> Set[Property]:
+    def required_analyzers(self) -> FrozenSet[Property]:
+        # checks are immutable, so the analyzers only need to be collected once
+        cached = self.__dict__.get("_required_analyzers")
+        if cached is not None:
+            return cached
 
         rc = (
             c.inner if isinstance(c, ConstraintDecorator) else c
@@ -128,7 +132,8 @@ class Check:
             list(filter(lambda c: isinstance(c, AnalysisBasedConstraint), rc)),
         )  # collect
 
-        analyzers = {c.analyzer for c in anbc}  # map
+        analyzers = frozenset(c.analyzer for c in anbc)  # map
+        object.__setattr__(self, "_required_analyzers", analyzers)
 
         return analyzers
 
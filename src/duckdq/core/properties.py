@@ -1,6 +1,7 @@
 import hashlib
+import re
 from abc import ABCMeta, abstractmethod
-from typing import List, Optional, Sequence
+from typing import List, Optional, Pattern, Sequence, Union
 import ctypes
 
 from duckdq.core.metrics import DoubleMetric, SchemaMetric, Entity
@@ -26,15 +27,21 @@ class Property(metaclass=ABCMeta):
     def __eq__(self, other):
         return (
             isinstance(other, Property)
-            and self.name == self.name
+            and self.name == other.name
             and self.instance == other.instance
             and self.entity == other.entity
             and self.where == other.where
         )
 
     def __hash__(self,):
-        s = self.name + self.instance + self.entity.name + ('' if self.where is None else self.where)
-        return int(hashlib.sha1(s.encode("utf-8")).hexdigest(), 16) % (10 ** 16)
+        # properties are looked up in metric maps for every constraint, only hash them once
+        # (subclasses may still adjust the instance in their __init__, so this is done lazily)
+        cached_hash = self.__dict__.get("_hash")
+        if cached_hash is None:
+            s = self.name + self.instance + self.entity.name + ('' if self.where is None else self.where)
+            cached_hash = int(hashlib.sha1(s.encode("utf-8")).hexdigest(), 16) % (10 ** 16)
+            self._hash = cached_hash
+        return cached_hash
 
     def filter_identifier(self,):
         if self.where is None:
@@ -147,13 +154,41 @@ class Compliance(DatasetProperty):
         super().__init__(name, where)
         self.expression = expression
 
+    def __eq__(self, other):
+        # the instance is only the name of the constraint, two rules may share a name
+        return (
+            super().__eq__(other)
+            and isinstance(other, Compliance)
+            and self.expression == other.expression
+        )
+
+    def __hash__(self):
+        return super().__hash__()
+
     def metric_type(self):
         return DoubleMetric
 
 
+# python regex flags that have an inline equivalent in the RE2 syntax used by the engines
+_INLINE_REGEX_FLAGS = {re.IGNORECASE: "i", re.MULTILINE: "m", re.DOTALL: "s"}
+
+
+def _pattern_with_inline_flags(pattern: Pattern) -> str:
+    # re.UNICODE is implied for str patterns and matches RE2's default behaviour
+    flags = pattern.flags & ~re.UNICODE
+    unsupported_flags = flags & ~(re.IGNORECASE | re.MULTILINE | re.DOTALL)
+    if unsupported_flags:
+        raise ValueError(f"Regex flags {re.RegexFlag(unsupported_flags)!r} of pattern {pattern.pattern!r} are not supported")
+    inline_flags = "".join(inline_flag for flag, inline_flag in _INLINE_REGEX_FLAGS.items() if flags & flag)
+    return f"(?{inline_flags}){pattern.pattern}" if inline_flags else pattern.pattern
+
+
 class PatternMatch(SingleColumnProperty):
-    def __init__(self, column: str, pattern: str, where: Optional[str] = None):
+    def __init__(self, column: str, pattern: Union[str, Pattern], where: Optional[str] = None):
         super().__init__(column, where)
+        # matching is done by the engine's regex implementation, flags of compiled patterns become inline flags
+        if isinstance(pattern, re.Pattern):
+            pattern = _pattern_with_inline_flags(pattern)
         self.pattern = pattern
         self.instance = f"{column}_{pattern}"
 
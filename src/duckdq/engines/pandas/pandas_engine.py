@@ -1,4 +1,5 @@
-from typing import Set, Sequence, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Set, Sequence, Dict, Tuple, List, Optional
 import multiprocessing
 
 from datasketches import kll_ints_sketch, kll_floats_sketch
@@ -12,14 +13,14 @@ from duckdq.core.preconditions import Precondition, HasColumn, IsNumeric, IsStri
 from duckdq.engines.pandas import sketch_utils
 from duckdq.engines.pandas.sketch_utils import DEFAULT_SKETCH_SIZE, DEFAULT_HLL_K, DEFAULT_HLL_TYPE
 from duckdq.metadata.metadata_repository import MetadataRepository
-from duckdq.core.states import QuantileState, ApproxDistinctState
-from duckdq.core.properties import Property, Quantile, ApproxDistinctness
+from duckdq.core.states import QuantileState, ApproxDistinctState, NumMatches
+from duckdq.core.properties import Property, Quantile, ApproxDistinctness, Size
 from duckdq.engines.engine import Engine
 from duckdq.engines.sql.sql_engine import DuckDBEngine
 from duckdq.utils.connection_handler import ConnectionHandler
-from duckdq.utils.exceptions import PreconditionNotMetException
+from duckdq.utils.exceptions import PreconditionNotMetException, EmptyStateException
 
-from duckdq.utils.metrics_helper import metric_from_value
+from duckdq.utils.metrics_helper import metric_from_failure, metric_from_value
 
 
 class PandasEngine(Engine):
@@ -65,50 +66,98 @@ class PandasEngine(Engine):
                 raise PreconditionNotMetException("At least one column needs to be specified!")
 
     def compute_metrics(self, properties: Set[Property], repo: MetadataRepository):
-        quantile_properties = [property for property in properties if isinstance(property, Quantile)]
-        quantile_metrics: Dict[Property, Metric] = {}
-        for quantile_property in quantile_properties:
-            data_col = self.data[quantile_property.column].to_numpy()
-            sketch_type = ""
-            if self.data[quantile_property.column].dtype == np.int64:
-                kll = kll_ints_sketch(DEFAULT_SKETCH_SIZE)
-                sketch_type = "ints"
-            elif self.data[quantile_property.column].dtype == np.float64:
-                kll = kll_floats_sketch(DEFAULT_SKETCH_SIZE)
-                sketch_type = "floats"
-            else:
-                raise NotImplementedError(f"Data Type {self.data[quantile_property.column].dtype} is not supported for sketches!")
-            kll.update(data_col)
-            quantile = kll.get_quantiles([quantile_property.quantile])[0]
-            serialized_kll = kll.serialize().hex() #bytes.fromhex()
+        sketch_properties = [property for property in properties if isinstance(property, (Quantile, ApproxDistinctness))]
+        # the size of the whole data frame is known without scanning it
+        size_properties = [property for property in properties if isinstance(property, Size) and property.where is None]
+        other_properties = [property for property in properties
+                            if not isinstance(property, (Quantile, ApproxDistinctness))
+                            and not (isinstance(property, Size) and property.where is None)]
+
+        if not sketch_properties:
+            metrics = self.engine.compute_metrics(other_properties, repo)
+        else:
+            metrics = self.compute_metrics_with_sketches(sketch_properties, other_properties, repo)
+
+        for size_property in size_properties:
+            size_state = repo.register_state(NumMatches(size_property.property_identifier(), len(self.data)))
+            metrics[size_property] = metric_from_value(
+                size_state.num_matches, size_property.name, size_property.instance, size_property.entity
+            )
+        return metrics
+
+    def compute_metrics_with_sketches(self, sketch_properties: List[Property], other_properties: List[Property],
+                                      repo: MetadataRepository) -> Dict[Property, Metric]:
+        # all quantiles of a column can be answered from a single sketch
+        quantile_groups: Dict[Tuple[str, Optional[str]], List[Quantile]] = {}
+        for property in sketch_properties:
+            if isinstance(property, Quantile):
+                quantile_groups.setdefault((property.column, property.where), []).append(property)
+
+        # the sketch updates hold the GIL, so they run one after another in a single worker thread
+        # and only overlap with the sql scan, which duckdb runs without the GIL on this one
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            sketch_futures = [executor.submit(self.compute_quantiles, quantile_properties)
+                              for quantile_properties in quantile_groups.values()]
+            sketch_futures += [executor.submit(self.compute_approx_distinctness, property)
+                               for property in sketch_properties if isinstance(property, ApproxDistinctness)]
+            metrics = self.engine.compute_metrics(other_properties, repo)
+            for sketch_future in sketch_futures:
+                for sketch_property, (state, metric) in sketch_future.result().items():
+                    if state is not None:
+                        repo.register_state(state)
+                    metrics[sketch_property] = metric
+        return metrics
+
+    def compute_quantiles(self, quantile_properties: List[Quantile]) -> Dict[Property, Tuple[Optional[QuantileState], Metric]]:
+        column = quantile_properties[0].column
+        data_col = self.data[column].to_numpy()
+        sketch_type = ""
+        # the sketches store 32 bit items, columns are narrowed to that width before the update
+        if data_col.dtype.kind == "i":
+            kll = kll_ints_sketch(DEFAULT_SKETCH_SIZE)
+            sketch_type = "ints"
+            int32_bounds = np.iinfo(np.int32)
+            if len(data_col) > 0 and (data_col.min() < int32_bounds.min or data_col.max() > int32_bounds.max):
+                raise NotImplementedError(f"Values of column {column} exceed the 32 bit range of the ints sketch!")
+            data_col = data_col.astype(np.int32, copy=False)
+        elif data_col.dtype == np.float64:
+            kll = kll_floats_sketch(DEFAULT_SKETCH_SIZE)
+            sketch_type = "floats"
+            data_col = data_col.astype(np.float32)
+        else:
+            raise NotImplementedError(f"Data Type {self.data[column].dtype} is not supported for sketches!")
+        kll.update(data_col)
+        if kll.is_empty():
+            # an empty sketch has no quantiles, report that instead of leaving the analysis missing
+            empty_results: Dict[Property, Tuple[Optional[QuantileState], Metric]] = {}
+            for quantile_property in quantile_properties:
+                ex = EmptyStateException(f"Empty state for analyzer {quantile_property}, column {column} has no values.")
+                empty_results[quantile_property] = (None, metric_from_failure(ex, quantile_property))
+            return empty_results
+        quantiles = kll.get_quantiles([quantile_property.quantile for quantile_property in quantile_properties])
+        serialized_kll = kll.serialize().hex() #bytes.fromhex()
+
+        results: Dict[Property, Tuple[Optional[QuantileState], Metric]] = {}
+        for quantile_property, quantile in zip(quantile_properties, quantiles):
             quantile_state = QuantileState(quantile_property.property_identifier(), serialized_kll, quantile, sketch_type)
-            repo.register_state(quantile_state)
             quantile_metric = metric_from_value(
                 quantile, quantile_property.name, quantile_property.instance, quantile_property.entity
             )
-            quantile_metrics[quantile_property] = quantile_metric
-
-        approx_distinct_properties = [property for property in properties if isinstance(property, ApproxDistinctness)]
-        approx_distinct_metrics: Dict[Property, Metric] = {}
-        for approx_distinct_property in approx_distinct_properties:
-            data_col = self.data[approx_distinct_property.column].to_numpy()
-            hll = hll_sketch(DEFAULT_HLL_K, DEFAULT_HLL_TYPE)
-            #for v in data_col: #slow
-            #    hll.update(v)
-            hll.update(data_col) #works with local fork (np.array extension)
-            approx_distinct_count = hll.get_estimate()
-            num_rows = len(data_col)
-            serialized_hll = hll.serialize_updatable().hex() #bytes.fromhex()
-            approx_distinct_state = ApproxDistinctState(approx_distinct_property.property_identifier(), serialized_hll, approx_distinct_count, num_rows)
-            repo.register_state(approx_distinct_state)
-            approx_distinctness = min(approx_distinct_count/num_rows, 1.00)
-            approx_distinct_metric = metric_from_value(
-                approx_distinctness, approx_distinct_property.name, approx_distinct_property.instance, approx_distinct_property.entity
-            )
-            approx_distinct_metrics[approx_distinct_property] = approx_distinct_metric
-
-        other_properties = [property for property in properties if (not isinstance(property, Quantile) and not isinstance(property, ApproxDistinctness))]
-        metrics = self.engine.compute_metrics(other_properties, repo)
-        metrics.update(quantile_metrics)
-        metrics.update(approx_distinct_metrics)
-        return metrics
+            results[quantile_property] = (quantile_state, quantile_metric)
+        return results
+
+    def compute_approx_distinctness(self, approx_distinct_property: ApproxDistinctness) -> Dict[Property, Tuple[ApproxDistinctState, Metric]]:
+        data_col = self.data[approx_distinct_property.column].to_numpy()
+        hll = hll_sketch(DEFAULT_HLL_K, DEFAULT_HLL_TYPE)
+        #for v in data_col: #slow
+        #    hll.update(v)
+        hll.update(data_col) #works with local fork (np.array extension)
+        approx_distinct_count = hll.get_estimate()
+        num_rows = len(data_col)
+        serialized_hll = hll.serialize_updatable().hex() #bytes.fromhex()
+        approx_distinct_state = ApproxDistinctState(approx_distinct_property.property_identifier(), serialized_hll, approx_distinct_count, num_rows)
+        approx_distinctness = min(approx_distinct_count/num_rows, 1.00)
+        approx_distinct_metric = metric_from_value(
+            approx_distinctness, approx_distinct_property.name, approx_distinct_property.instance, approx_distinct_property.entity
+        )
+        return {approx_distinct_property: (approx_distinct_state, approx_distinct_metric)}
@@ -99,7 +99,8 @@ class SQLEngine(Engine):
                                                    f"is neither Scan nor Grouping operator.")
 
         if schema_property is not None:
-            schema = self.get_schema()
+            # fetched when the engine was created, no need to query the catalog again
+            schema = self.schema
             schema_state = SchemaState(schema_property.property_identifier(),schema)
             repo.register_state(schema_state)
             schema_metric = metric_from_value(
@@ -133,7 +134,8 @@ class SQLEngine(Engine):
                 query = f"SELECT {', '.join(list(grouping_columns) + ['COUNT(*) as count'])} FROM {self.table} WHERE {grouping.filter} GROUP BY {', '.join(grouping_columns)}"
 
             frequencies_table = repo.get_frequency_table_name(grouping.identifier())
-            if self.is_local_state_handler(repo):
+            local_state_handler = self.is_local_state_handler(repo)
+            if local_state_handler:
                 self.execute_and_store(query, frequencies_table)
                 state = FrequenciesAndNumRows(grouping.identifier(), frequencies_table, grouping_columns, num_rows)
             else:
@@ -153,6 +155,11 @@ class SQLEngine(Engine):
                 state.id = operator.get_property().property_identifier()
                 state = repo.register_state(state)
 
+            if not local_state_handler:
+                # the state keeps the frequencies as a data frame, the temporary table would
+                # otherwise stay around for as long as the (shared) connection is open
+                self.con.execute(f"DROP TABLE IF EXISTS {frequencies_table}")
+
         return metrics
 
     @abstractmethod
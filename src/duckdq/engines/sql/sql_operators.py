@@ -1,3 +1,4 @@
+import ctypes
 import json
 from abc import ABCMeta, abstractmethod
 from typing import List, FrozenSet, Optional
@@ -171,7 +172,9 @@ class ComplianceOperator(ScanShareableOperator):
 
     def __init__(self, property: Compliance):
         self.count_column = f"count{property.filter_identifier()}"
-        self.count_compliance_column = f"count_compliance{property.property_identifier()}".lower()
+        # the property identifier only covers the rule's name, rules sharing a name need their own column
+        expression_identifier = ctypes.c_size_t(hash(property.expression)).value
+        self.count_compliance_column = f"count_compliance{property.property_identifier()}_{expression_identifier}".lower()
 
         if property.where is None:
             aggregations = [f"COUNT(*) as {self.count_column}",
@@ -200,13 +203,14 @@ class PatternMatchOperator(ScanShareableOperator):
     def __init__(self, property: PatternMatch):
         self.count_column = f"count{property.filter_identifier()}"
         self.count_pattern_match_column = f"count_pattern_match{property.property_identifier()}".lower()
+        pattern = property.pattern.replace("'", "''")
 
         if property.where is None:
             aggregations = [f"COUNT(*) as {self.count_column}",
-                            f"SUM(CASE WHEN regexp_full_match({property.column},'{property.pattern}') THEN 1 ELSE 0 END) as {self.count_pattern_match_column}"]
+                            f"SUM(CASE WHEN regexp_full_match({property.column},'{pattern}') THEN 1 ELSE 0 END) as {self.count_pattern_match_column}"]
         else:
             aggregations = [f"SUM(CASE WHEN ({property.where}) THEN 1 ELSE 0 END) as {self.count_column}",
-                            f"SUM(CASE WHEN ({property.where}) AND (regexp_full_match({property.column},'{property.pattern}')) THEN 1 ELSE 0 END) as {self.count_pattern_match_column}"]
+                            f"SUM(CASE WHEN ({property.where}) AND (regexp_full_match({property.column},'{pattern}')) THEN 1 ELSE 0 END) as {self.count_pattern_match_column}"]
 
         super().__init__(property, aggregations)
 
@@ -282,7 +286,7 @@ class MinimumOperator(ScanShareableOperator):
         if property.where is None:
             aggregations = [f"min({property.column}) as {self.min_col}"]
         else:
-            aggregations = [f"min(CASE WHEN ({property.where}) THEN {property.column}) ELSE NULL END) as {self.min_col}"]
+            aggregations = [f"min(CASE WHEN ({property.where}) THEN {property.column} ELSE NULL END) as {self.min_col}"]
 
         super().__init__(property, aggregations)
 
@@ -56,16 +56,10 @@ class MetadataRepository(metaclass=ABCMeta):
 
 
 class InMemoryMetadataRepository(MetadataRepository):
+    # metrics and states only live in the AnalyzerContext of a run, nothing is kept here
     def __init__(self):
-        self.state_map = {}
-        self.metric_map = {}
         super().set_dataset()
 
-    def register_state(self, state: State) -> State:
-        state_id = state.id
-        self.state_map[state_id] = state
-        return state
-
     def add_profile(self, profile: Dict):
         return None
 
@@ -201,9 +201,10 @@ class VerificationSuite:
 
         """
         required_analyzers = required_analyzers or ()
-        analyzers = required_analyzers + tuple(
-            [a for check in checks for a in check.required_analyzers()]
-        )
+        # several checks often share analyzers, only compute each of them once
+        analyzers = tuple(dict.fromkeys(
+            required_analyzers + tuple(a for check in checks for a in check.required_analyzers())
+        ))
 
         # This rhis returns AnalysisContext
         analysis_result = do_analysis_run(engine, repo, analyzers)
@@ -24,7 +24,9 @@
     https://pytest.org/latest/plugins.html
 """
 
-# import pytest
+import pytest
+
+from duckdq.utils.connection_handler import ConnectionHandler
 from tests.fixtures import ( # noqa:
     df_full,
     df_missing,
@@ -32,4 +34,16 @@ from tests.fixtures import ( # noqa:
     df_comp_incomp,
     df_with_distinct_values,
     df_with_unique_columns,
+    df_with_emails,
+    df_with_mixed_emails,
+    df_with_urls,
+    df_with_mixed_urls,
+    df_with_credit_card_numbers,
 )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def duckdb_connections():
+    # keep the handled connections open for the whole session and close them once at the end
+    yield
+    ConnectionHandler.close_connections()
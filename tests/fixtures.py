@@ -127,6 +127,56 @@ def df_with_distinct_values():
     )
 
 
+@pytest.fixture(scope="module")
+def df_with_emails():
+    return pd.DataFrame({"someCol": ["someone@somewhere.org", "someone@else.com"]})
+
+
+@pytest.fixture(scope="module")
+def df_with_mixed_emails():
+    return pd.DataFrame(
+        {
+            "value": ["someone@somewhere.org", "someone@else"],
+            "type": ["valid", "invalid"],
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def df_with_urls():
+    return pd.DataFrame(
+        {
+            "someCol": [
+                "https://www.example.com/foo/?bar=baz&inga=42&quux",
+                "https://foo.bar/baz",
+            ]
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def df_with_mixed_urls():
+    return pd.DataFrame(
+        {
+            "value": [
+                "https://www.example.com/foo/?bar=baz&inga=42&quux",
+                "http:// shouldfail.com",
+            ],
+            "type": ["valid", "invalid"],
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def df_with_credit_card_numbers():
+    return pd.DataFrame(
+        {
+            "value": ["4111 1111 1111 1111", "9999888877776666"],
+            "type": ["valid", "invalid"],
+        }
+    )
+
+
 def df_strategy(allow_nan=True, allow_infinity=True):
     """
     This strategies generates dataframes that might containing
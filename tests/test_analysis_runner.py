@@ -28,6 +28,7 @@ from duckdq.core.properties import (
     Minimum,
     Size,
     StandardDeviation, ApproxDistinctness,
+    Uniqueness,
 )
 from duckdq.engines import PandasEngine
 from duckdq.metadata.metadata_repository import InMemoryMetadataRepository
@@ -154,3 +155,26 @@ class TestAnalysis:
         assert ctx.metric(analyzers[1]) == DoubleMetric(
             Entity.COLUMN, "Maximum", "att1", Success(3.0)
         )
+
+    def test_compute_analyzers_with_equal_instances_separately_across_runs(self):
+        # the instances of both analyzers are "a_b"
+        df = pd.DataFrame({"a_b": [1, 1, 1], "a": [1, 2, 3], "b": [1, 1, 1]})
+
+        ctx_two_columns = do_analysis_run(PandasEngine(df), InMemoryMetadataRepository(), [Uniqueness(["a", "b"])])
+        ctx_one_column = do_analysis_run(PandasEngine(df), InMemoryMetadataRepository(), [Uniqueness(["a_b"])])
+
+        ConnectionHandler.close_connections()
+
+        assert ctx_two_columns.metric(Uniqueness(["a", "b"])).value.get() == 1.0
+        assert ctx_one_column.metric(Uniqueness(["a_b"])).value.get() == 0.0
+
+    def test_drop_temporary_frequency_tables(self, df_with_numeric_values):
+        engine = PandasEngine(df_with_numeric_values)
+        repo = InMemoryMetadataRepository()
+
+        do_analysis_run(engine, repo, [Uniqueness(["att1"]), Uniqueness(["att2"])])
+        tables = engine.engine.con.execute("SELECT table_name FROM duckdb_tables()").fetchall()
+
+        ConnectionHandler.close_connections()
+
+        assert tables == []
@@ -16,10 +16,13 @@
 # limitations under the License.
 
 # coding: utf-8
+import re
 from datetime import datetime
+from typing import Dict, Tuple
 
 import duckdq.utils.patterns as patterns
 import pandas as pd
+import pytest
 from duckdq.core.properties import Maximum, Mean, Minimum, Quantile, StandardDeviation, Sum
 from duckdq.engines import PandasEngine
 from duckdq.metadata.metadata_repository import InMemoryMetadataRepository
@@ -27,15 +30,33 @@ from duckdq.utils.analysis_runner import AnalyzerContext
 from duckdq.utils.analysis_runner import do_analysis_run
 from duckdq.checks import Check, CheckLevel, CheckStatus, is_one
 from duckdq.constraints import ConstraintStatus
-from duckdq.utils.connection_handler import ConnectionHandler
+
+
+# successful metrics computed per data frame, the frame itself is kept to make sure its id is not reused
+_RESULT_CACHE: Dict[int, Tuple[pd.DataFrame, AnalyzerContext]] = {}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def result_cache():
+    # frames are only shared within a module, do not keep them (or their metrics) alive any longer
+    yield
+    _RESULT_CACHE.clear()
 
 
 def run_checks(data, *checks) -> AnalyzerContext:
-    analyzers = tuple([a for check in checks for a in check.required_analyzers()])
-    engine = PandasEngine(data)
-    repo = InMemoryMetadataRepository()
-    result = do_analysis_run(engine, repo, analyzers)
-    ConnectionHandler.close_connections()
+    analyzers = tuple(dict.fromkeys(a for check in checks for a in check.required_analyzers()))
+    cached_data, result = _RESULT_CACHE.get(id(data), (None, AnalyzerContext()))
+    if cached_data is not data:
+        result = AnalyzerContext()
+
+    missing_analyzers = tuple(a for a in analyzers if a not in result.metric_map)
+    if missing_analyzers:
+        engine = PandasEngine(data)
+        repo = InMemoryMetadataRepository()
+        result = result + do_analysis_run(engine, repo, missing_analyzers)
+        # failed metrics are not cached, they are computed again by the next run that needs them
+        successful_metrics = {a: m for a, m in result.metric_map.items() if m.value.isSuccess}
+        _RESULT_CACHE[id(data)] = (data, AnalyzerContext(successful_metrics))
     return result
 
 def assert_evals_to(check: Check, context: AnalyzerContext, status: CheckStatus):
@@ -45,6 +66,18 @@ def assert_evals_to(check: Check, context: AnalyzerContext, status: CheckStatus)
 def is_success(check, context):
     return check.evaluate(context).status == CheckStatus.SUCCESS
 
+class TestRequiredAnalyzers:
+    def test_required_analyzers_are_computed_once_per_check(self):
+        check = (
+            Check(CheckLevel.EXCEPTION, "group-1")
+                .is_complete("att1")
+                .has_completeness("att1", lambda v: v > 0.5)
+        )
+
+        assert len(check.required_analyzers()) == 1
+        assert check.required_analyzers() is check.required_analyzers()
+
+
 class TestSchemaCheck:
     def test_column_exists(self, df_comp_incomp):
         df = df_comp_incomp
@@ -283,6 +316,29 @@ class TestChecksOnBasicStats:
             base_check.has_approx_quantile("att1", 0.1, lambda v: v == 1.0), context_numeric
         )
 
+    def test_quantiles_of_an_empty_column_fail_with_a_reason(self):
+        df = pd.DataFrame({"att1": pd.Series([], dtype="int64")})
+        engine = PandasEngine(df)
+        repo = InMemoryMetadataRepository()
+        context = do_analysis_run(engine, repo, [Quantile("att1", 0.5)])
+
+        metric = context.metric(Quantile("att1", 0.5))
+        assert metric is not None
+        assert metric.value.isFailure
+
+        check = Check(CheckLevel.EXCEPTION, "a").has_approx_quantile("att1", 0.5, lambda v: v == 1.0)
+        result = check.evaluate(context)
+        assert result.status == CheckStatus.ERROR
+        assert "Empty state" in result.constraint_results[0].message
+
+    def test_quantiles_of_integers_beyond_the_sketch_range_are_not_supported(self):
+        df = pd.DataFrame({"att1": [1, 2 ** 40]})
+        engine = PandasEngine(df)
+        repo = InMemoryMetadataRepository()
+
+        with pytest.raises(NotImplementedError):
+            do_analysis_run(engine, repo, [Quantile("att1", 0.5)])
+
     def test_correctly_evaluate_mean_constraints(self, df_with_numeric_values):
 
         df = df_with_numeric_values
@@ -299,6 +355,22 @@ class TestChecksOnBasicStats:
         assert is_success(mean_check, ctx)
         assert is_success(mean_check_with_filter, ctx)
 
+    def test_correctly_evaluate_min_max_constraints_with_filter(self, df_with_numeric_values):
+
+        df = df_with_numeric_values
+
+        min_max_check = (
+            Check(CheckLevel.EXCEPTION, "a")
+            .has_min("att1", lambda v: v == 4.0)
+            .where("att2 > 0")
+            .has_max("att1", lambda v: v == 3.0)
+            .where("att2 = 0")
+        )
+
+        ctx = run_checks(df, min_max_check)
+
+        assert is_success(min_max_check, ctx)
+
     def test_correctly_evaluate_size_constraint(self, df_with_numeric_values):
         df = df_with_numeric_values
         nrows = len(df)
@@ -373,6 +445,29 @@ class TestSatifiesCheck:
         assert_evals_to(check_fail, context, CheckStatus.ERROR)
         assert_evals_to(check_partially_satisfied, context, CheckStatus.SUCCESS)
 
+    def test_rules_with_the_same_name_are_computed_separately(self, df_with_numeric_values):
+        df = df_with_numeric_values
+
+        check1 = Check(CheckLevel.EXCEPTION, "group-1").satisfies("att1 > 0", "rule1")
+        check2 = Check(CheckLevel.EXCEPTION, "group-2").satisfies(
+            "att1 > 3", "rule1", lambda v: v == 0.5
+        )
+
+        assert_evals_to(check1, run_checks(df, check1), CheckStatus.SUCCESS)
+        assert_evals_to(check2, run_checks(df, check2), CheckStatus.SUCCESS)
+
+    def test_rules_with_the_same_name_are_computed_separately_in_one_run(self, df_with_numeric_values):
+        df = df_with_numeric_values
+
+        check = (
+            Check(CheckLevel.EXCEPTION, "a")
+            .satisfies("att1 > 0", "rule1")
+            .satisfies("att1 > 3", "rule1", lambda v: v == 0.5)
+        )
+
+        context = run_checks(df, check)
+        assert_evals_to(check, context, CheckStatus.SUCCESS)
+
     def test_correctly_evaluate_non_negative_and_positive_constraints(
         self, df_with_numeric_values
     ):
@@ -553,50 +648,58 @@ class TestUniquenessCheck:
 
 
 class TestPatternMatchCheck:
-    def test_has_pattern_work_with_normal_patterns(self,):
-        col = "someCol"
-        df = pd.DataFrame({col: ["someone@somewhere.org", "someone@else.com"]})
+    def test_has_pattern_work_with_normal_patterns(self, df_with_emails):
+        df = df_with_emails
 
         check = Check(CheckLevel.EXCEPTION, "some description").has_pattern(
-            col, patterns.EMAIL
+            "someCol", patterns.EMAIL
         )
         context = run_checks(df, check)
         assert_evals_to(check, context, CheckStatus.SUCCESS)
 
-    def test_fail_on_mixed_data_for_email(self,):
+    def test_has_pattern_work_with_compiled_patterns(self,):
         col = "someCol"
-        df = pd.DataFrame({col: ["someone@somewhere.org", "someone@else"]})
+        df = pd.DataFrame({col: ["it's", "that's"]})
 
         check = Check(CheckLevel.EXCEPTION, "some description").has_pattern(
-            col, patterns.EMAIL
+            col, re.compile("[a-z]+'s")
         )
         context = run_checks(df, check)
-        assert_evals_to(check, context, CheckStatus.ERROR)
+        assert_evals_to(check, context, CheckStatus.SUCCESS)
 
-    def test_on_regular_expression_patterns_for_urls(self,):
+    def test_has_pattern_keeps_flags_of_compiled_patterns(self,):
         col = "someCol"
-        df = pd.DataFrame(
-            {
-                col: [
-                    "https://www.example.com/foo/?bar=baz&inga=42&quux",
-                    "https://foo.bar/baz",
-                ]
-            }
-        )
+        df = pd.DataFrame({col: ["ABC", "abc"]})
+
         check = Check(CheckLevel.EXCEPTION, "some description").has_pattern(
-            col, patterns.URL
+            col, re.compile("abc", re.IGNORECASE)
         )
         context = run_checks(df, check)
         assert_evals_to(check, context, CheckStatus.SUCCESS)
 
-    def test_work_on_regular_expression_with_filtering(self,):
+        with pytest.raises(ValueError):
+            Check(CheckLevel.EXCEPTION, "some description").has_pattern(col, re.compile("abc", re.VERBOSE))
+
+    def test_fail_on_mixed_data_for_email(self, df_with_mixed_emails):
+        df = df_with_mixed_emails
 
-        df = pd.DataFrame(
-            {
-                "value": ["someone@somewhere.org", "someone@else"],
-                "type": ["valid", "invalid"],
-            }
+        check = Check(CheckLevel.EXCEPTION, "some description").has_pattern(
+            "value", patterns.EMAIL
         )
+        context = run_checks(df, check)
+        assert_evals_to(check, context, CheckStatus.ERROR)
+
+    def test_on_regular_expression_patterns_for_urls(self, df_with_urls):
+        df = df_with_urls
+
+        check = Check(CheckLevel.EXCEPTION, "some description").has_pattern(
+            "someCol", patterns.URL
+        )
+        context = run_checks(df, check)
+        assert_evals_to(check, context, CheckStatus.SUCCESS)
+
+    def test_work_on_regular_expression_with_filtering(self, df_with_mixed_emails):
+        df = df_with_mixed_emails
 
         check = Check(CheckLevel.EXCEPTION, "some description").has_pattern(
             "value", patterns.EMAIL, lambda v: v == 0.5
@@ -613,29 +716,18 @@ class TestPatternMatchCheck:
         assert_evals_to(check, context, CheckStatus.SUCCESS)
         assert_evals_to(check_with_filter, context, CheckStatus.SUCCESS)
 
-    def test_fails_on_mixed_data_for_url_pattern(self,):
-        col = "someCol"
-        df = pd.DataFrame(
-            {
-                col: [
-                    "https://www.example.com/foo/?bar=baz&inga=42&quux",
-                    "http:// shouldfail.com",
-                ],
-            }
-        )
+    def test_fails_on_mixed_data_for_url_pattern(self, df_with_mixed_urls):
+        df = df_with_mixed_urls
+
         check = Check(CheckLevel.EXCEPTION, "some description").has_pattern(
-            col, patterns.URL
+            "value", patterns.URL
         )
         context = run_checks(df, check)
         assert_evals_to(check, context, CheckStatus.ERROR)
 
-    def test_contains_credit_card_number(self,):
-        df = pd.DataFrame(
-            {
-                "value": ["4111 1111 1111 1111", "9999888877776666"],
-                "type": ["valid", "invalid"],
-            }
-        )
+    def test_contains_credit_card_number(self, df_with_credit_card_numbers):
+        df = df_with_credit_card_numbers
+
         check = Check(CheckLevel.EXCEPTION, "some description").contains_credit_card_number(
             "value", lambda v: v == 0.5
         )
@@ -650,13 +742,9 @@ class TestPatternMatchCheck:
         assert_evals_to(check, context, CheckStatus.SUCCESS)
         assert_evals_to(check_with_filter, context, CheckStatus.SUCCESS)
 
-    def test_contains_email(self,):
-        df = pd.DataFrame(
-            {
-                "value": ["someone@somewhere.org", "someone@else"],
-                "type": ["valid", "invalid"],
-            }
-        )
+    def test_contains_email(self, df_with_mixed_emails):
+        df = df_with_mixed_emails
+
         check = Check(CheckLevel.EXCEPTION, "some description").contains_email(
             "value", lambda v: v == 0.5
         )
@@ -671,16 +759,9 @@ class TestPatternMatchCheck:
         assert_evals_to(check, context, CheckStatus.SUCCESS)
         assert_evals_to(check_with_filter, context, CheckStatus.SUCCESS)
 
-    def test_contains_url(self,):
-        df = pd.DataFrame(
-            {
-                "value": [
-                    "https://www.example.com/foo/?bar=baz&inga=42&quux",
-                    "http:// shouldfail.com",
-                ],
-                "type": ["valid", "invalid"],
-            }
-        )
+    def test_contains_url(self, df_with_mixed_urls):
+        df = df_with_mixed_urls
+
         check = Check(CheckLevel.EXCEPTION, "some description").contains_url(
             "value", lambda v: v == 0.5
         )
@@ -31,7 +31,7 @@ from duckdq.utils.connection_handler import ConnectionHandler
 
 
 def run_checks(data, *checks) -> AnalyzerContext:
-    analyzers = tuple([a for check in checks for a in check.required_analyzers()])
+    analyzers = tuple(dict.fromkeys(a for check in checks for a in check.required_analyzers()))
     engine = PandasEngine(data)
     repo = SQLMetadataRepositoryFactory.create_sql_metadata_repository("duckdb://:memory:")
     repo.set_dataset("data","1")
@@ -16,7 +16,10 @@
 # limitations under the License.
 
 from itertools import permutations
+import duckdq.verification_suite
 from duckdq.checks import Check, CheckLevel, CheckStatus
+from duckdq.core.properties import Completeness, Minimum
+from duckdq.utils.analysis_runner import do_analysis_run
 from duckdq.verification_suite import VerificationSuite
 
 
@@ -60,6 +63,34 @@ class TestVerificationRun:
         assert vr.status == CheckStatus.SUCCESS
         assert len(vr.check_results) == 0
 
+    def test_run_analyzers_shared_by_checks_only_once(self, df_with_numeric_values, monkeypatch):
+        df = df_with_numeric_values
+        passed_analyzers = []
+
+        def recording_analysis_run(engine, repo, analyzers):
+            passed_analyzers.append(analyzers)
+            return do_analysis_run(engine, repo, analyzers)
+
+        monkeypatch.setattr(duckdq.verification_suite, "do_analysis_run", recording_analysis_run)
+
+        check1 = (
+            Check(CheckLevel.EXCEPTION, "group-1")
+            .is_complete("att1")
+            .has_completeness("att1", lambda v: v > 0.5)
+        )
+        check2 = (
+            Check(CheckLevel.EXCEPTION, "group-2")
+            .is_complete("att1")
+            .has_min("att1", lambda v: v > 0)
+        )
+
+        vr = VerificationSuite().add_checks([check1, check2]).run(df)
+
+        assert vr.status == CheckStatus.SUCCESS
+        assert len(passed_analyzers) == 1
+        assert len(passed_analyzers[0]) == 2
+        assert set(passed_analyzers[0]) == {Completeness("att1"), Minimum("att1")}
+
     def test_should_return_correct_status_regardless_of_order(self, df_comp_incomp):
         df = df_comp_incomp
 